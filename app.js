@@ -26,10 +26,9 @@ const oracleApp = (() => {
       return deckCache;
     }
 
-    const hasEmbeddedDeck = Array.isArray(window.ORACLE_DECK) && window.ORACLE_DECK.length > 0;
-    const isFileProtocol = window.location.protocol === "file:";
-
-    if (isFileProtocol && hasEmbeddedDeck) {
+    // deck-data.js carries the deck in every build (and the only copy with
+    // fingerprinted image paths in a deploy build), so prefer it.
+    if (Array.isArray(window.ORACLE_DECK) && window.ORACLE_DECK.length > 0) {
       deckCache = window.ORACLE_DECK;
       return deckCache;
     }
@@ -43,10 +42,6 @@ const oracleApp = (() => {
       deckCache = data;
       return data;
     } catch (error) {
-      if (hasEmbeddedDeck) {
-        deckCache = window.ORACLE_DECK;
-        return deckCache;
-      }
       throw new Error(
         "Unable to load deck data. Ensure deck-data.js is loaded before app.js."
       );
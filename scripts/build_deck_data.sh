@@ -2,6 +2,13 @@
 set -euo pipefail
 
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+DIST_DIR=""
+if [[ "${1:-}" == "--dist" ]]; then
+  DIST_DIR="${2:?--dist requires an output directory}"
+  shift 2
+fi
+
 DECK_JSON="${1:-$ROOT_DIR/deck.json}"
 OUTPUT_JS="${2:-$ROOT_DIR/deck-data.js}"
 
@@ -18,3 +25,7 @@ fi
 } > "$OUTPUT_JS"
 
 echo "Wrote $OUTPUT_JS"
+
+if [[ -n "$DIST_DIR" ]]; then
+  python3 "$ROOT_DIR/scripts/fingerprint_assets.py" --deck "$DECK_JSON" --root "$ROOT_DIR" --out "$DIST_DIR"
+fi
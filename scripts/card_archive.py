@@ -0,0 +1,108 @@
+"""Stream generated card files into a single tar or zip archive.
+
+Entries are written straight from memory as they are rendered, so a build
+with thousands of cards is one sequential write instead of one file per
+card. Entry names mirror the site layout (``cards/<card-id>.svg``), so
+extracting the archive at the site root restores the usual tree. An
+``index.json`` entry listing every file with its size and SHA-256 is
+appended when the archive is closed. Entries can also carry the card they
+belong to and the ``image`` path to apply once the archive is extracted,
+since the generators leave deck.json alone in archive mode. If the ``with`` block raises, the
+partial archive is deleted instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any
+
+INDEX_NAME = "index.json"
+# Already-compressed formats gain nothing from deflate.
+STORED_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+class CardArchive:
+    """Write-only archive of card files, picked by the path's suffix.
+
+    With ``compress``, zip entries are deflated individually (text formats
+    only). Tar archives are gzip-compressed as a whole when the path ends in
+    ``.tar.gz`` or ``.tgz``; ``compress`` with a plain ``.tar`` is an error.
+    """
+
+    def __init__(self, path: Path, compress: bool = False) -> None:
+        name = path.name.lower()
+        if not name.endswith(ARCHIVE_SUFFIXES):
+            raise SystemExit(
+                f"Unsupported archive type for {path}; use one of {', '.join(ARCHIVE_SUFFIXES)}"
+            )
+        if compress and name.endswith(".tar"):
+            raise SystemExit(f"{path}: a .tar archive cannot be compressed; use .tar.gz or .tgz")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.compress = compress
+        self.entries: list[dict[str, Any]] = []
+        self.date_time = time.localtime()[:6]
+        if name.endswith(".zip"):
+            self.zip: zipfile.ZipFile | None = zipfile.ZipFile(path, "w")
+            self.tar: tarfile.TarFile | None = None
+        else:
+            self.zip = None
+            self.tar = tarfile.open(path, "w:gz" if name.endswith((".gz", ".tgz")) else "w")
+
+    def add(self, name: str, data: bytes, card: dict[str, Any] | None = None) -> None:
+        compressed = False
+        if self.zip is not None:
+            compressed = self.compress and Path(name).suffix.lower() not in STORED_SUFFIXES
+            info = zipfile.ZipInfo(name, date_time=self.date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED if compressed else zipfile.ZIP_STORED
+            self.zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.tar.addfile(info, io.BytesIO(data))
+        entry: dict[str, Any] = {
+            "name": name,
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "compressed": compressed,
+        }
+        if card:
+            entry.update(card)
+        self.entries.append(entry)
+
+    def close(self) -> None:
+        index = json.dumps({"files": self.entries}, indent=2).encode("utf-8")
+        if self.zip is not None:
+            self.zip.writestr(zipfile.ZipInfo(INDEX_NAME, date_time=self.date_time), index)
+            self.zip.close()
+        else:
+            info = tarfile.TarInfo(INDEX_NAME)
+            info.size = len(index)
+            info.mtime = int(time.time())
+            self.tar.addfile(info, io.BytesIO(index))
+            self.tar.close()
+
+    def abort(self) -> None:
+        """Close without writing the index and delete the partial archive."""
+        if self.zip is not None:
+            self.zip.close()
+        else:
+            self.tar.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> CardArchive:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if exc_info[0] is not None:
+            self.abort()
+        else:
+            self.close()
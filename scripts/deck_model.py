@@ -0,0 +1,129 @@
+"""Card model and deck.json loader shared by the card scripts.
+
+Every card is validated and normalised once, when the deck is loaded:
+strings are stripped, keyword lists become tuples of interned strings (the
+same tags repeat across many cards), and the optional ``priority`` field is
+parsed to a number. Scripts then read plain attributes instead of
+re-checking ``dict`` fields in their loops. Unknown fields are kept and
+written back unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+FIELDS = ("id", "title", "keywords", "reversed", "prompt", "image")
+
+
+class Card:
+    __slots__ = ("id", "title", "keywords", "reversed", "prompt", "image", "priority", "extra")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        keywords: tuple[str, ...] = (),
+        reversed: tuple[str, ...] = (),
+        prompt: str = "",
+        image: str = "",
+        priority: float | None = None,
+        extra: dict[str, Any] | None = None,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.keywords = keywords
+        self.reversed = reversed
+        self.prompt = prompt
+        self.image = image
+        self.priority = priority
+        self.extra = extra
+
+    def __repr__(self) -> str:
+        return f"Card(id={self.id!r}, title={self.title!r})"
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Card:
+        """Build a card from one deck.json entry, raising ValueError if it is malformed."""
+        if not isinstance(data, dict):
+            raise ValueError("card must be an object")
+
+        card_id = text_field(data, "id")
+        if not card_id:
+            raise ValueError("card has no id")
+
+        priority = data.get("priority")
+        if priority is not None and (isinstance(priority, bool) or not isinstance(priority, (int, float))):
+            raise ValueError(f"{card_id}: priority must be a number")
+
+        extra = {key: value for key, value in data.items() if key not in FIELDS and key != "priority"}
+        return cls(
+            sys.intern(card_id),
+            text_field(data, "title") or card_id,
+            tag_field(data, "keywords"),
+            tag_field(data, "reversed"),
+            text_field(data, "prompt"),
+            text_field(data, "image"),
+            None if priority is None else float(priority),
+            extra or None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "id": self.id,
+            "title": self.title,
+            "keywords": list(self.keywords),
+            "reversed": list(self.reversed),
+            "prompt": self.prompt,
+            "image": self.image,
+        }
+        if self.priority is not None:
+            data["priority"] = int(self.priority) if self.priority.is_integer() else self.priority
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+def text_field(data: dict[str, Any], key: str) -> str:
+    value = data.get(key, "")
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+    return value.strip()
+
+
+def tag_field(data: dict[str, Any], key: str) -> tuple[str, ...]:
+    value = data.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(tag, str) for tag in value):
+        raise ValueError(f"{key} must be a list of strings")
+    return tuple(sys.intern(tag.strip()) for tag in value)
+
+
+def load_deck(path: Path) -> list[Card]:
+    with path.open("r", encoding="utf-8") as handle:
+        raw = json.load(handle)
+    if not isinstance(raw, list):
+        raise SystemExit(f"{path}: expected a list of cards")
+
+    deck = []
+    seen: set[str] = set()
+    for index, entry in enumerate(raw):
+        try:
+            card = Card.from_dict(entry)
+        except ValueError as exc:
+            raise SystemExit(f"{path}: card {index}: {exc}") from exc
+        if card.id in seen:
+            raise SystemExit(f"{path}: card {index}: duplicate id {card.id}")
+        seen.add(card.id)
+        deck.append(card)
+    return deck
+
+
+def deck_to_json(deck: list[Card]) -> str:
+    return json.dumps([card.to_dict() for card in deck], ensure_ascii=False, indent=2)
+
+
+def save_deck(path: Path, deck: list[Card]) -> None:
+    # One write of the whole document instead of json.dump's many small ones.
+    path.write_text(deck_to_json(deck) + "\n", encoding="utf-8")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Build a deploy directory with content-hashed asset names.
+
+This script:
+1) copies every card image referenced by deck.json to dist/cards/<name>.<hash>.<ext>
+2) writes dist/deck-data.<hash>.js with the image paths rewritten
+3) fingerprints the scripts and stylesheets the HTML pages load and rewrites
+   the pages to point at them
+4) writes dist/asset-manifest.json and a service-worker precache list
+
+Fingerprinted files never change content, so they can be served with
+``Cache-Control: immutable``. HTML pages keep their names and should be
+revalidated. Card images are also copied under their plain names, and hashed
+card images from earlier builds are kept, because saved readings in the
+browser refer to them by URL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+from deck_model import Card, deck_to_json, load_deck
+
+HASH_LENGTH = 10
+PLACEHOLDER_IMAGE = "cards/placeholder.svg"
+MANIFEST_FILENAME = "asset-manifest.json"
+PRECACHE_FILENAME = "precache-manifest.js"
+BUILD_MARKER = ".fingerprint-build"
+ASSET_REFERENCE = re.compile(r'(\s(?:src|href)=")([^"#?:]+)(")')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build fingerprinted deploy assets.")
+    parser.add_argument("--deck", default="deck.json", help="Path to deck data JSON")
+    parser.add_argument("--root", default="", help="Site root (default: the deck's directory)")
+    parser.add_argument("--out", default="dist", help="Output directory for the deploy build")
+    return parser.parse_args()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(logical: str, digest: str) -> str:
+    path = Path(logical)
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def normalize(reference: str) -> str:
+    return reference[2:] if reference.startswith("./") else reference
+
+
+def emit(out_dir: Path, logical: str, data: bytes, manifest: dict[str, str]) -> str:
+    """Write ``data`` under its fingerprinted name and record it in the manifest."""
+    hashed = fingerprinted_name(logical, content_hash(data))
+    target = out_dir / hashed
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists():
+        target.write_bytes(data)
+    manifest[logical] = hashed
+    return hashed
+
+
+def prepare_out_dir(out_dir: Path, sources: list[Path]) -> None:
+    """Clear the previous build from ``out_dir``, keeping its hashed card images.
+
+    Only an empty directory or one marked by an earlier build is cleared, and
+    never one that holds the site root or the deck.
+    """
+    resolved = out_dir.resolve()
+    for source in sources:
+        source = source.resolve()
+        if resolved == source or resolved in source.parents:
+            raise SystemExit(f"Refusing to build into {out_dir}: it contains {source}")
+
+    if out_dir.exists():
+        if any(out_dir.iterdir()) and not (out_dir / BUILD_MARKER).exists():
+            raise SystemExit(
+                f"Refusing to clear {out_dir}: it is not empty and has no {BUILD_MARKER} from an earlier build"
+            )
+        for entry in out_dir.iterdir():
+            if entry.name == "cards" and entry.is_dir() and not entry.is_symlink():
+                continue
+            if entry.is_dir() and not entry.is_symlink():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / BUILD_MARKER).write_text("Built by fingerprint_assets.py; cleared on rebuild.\n", encoding="utf-8")
+
+
+def deck_data_js(deck_name: str, deck: list[Card]) -> bytes:
+    # Same layout as build_deck_data.sh so the bundle matches a regular build.
+    body = deck_to_json(deck)
+    return f"// Auto-generated from {deck_name}\nwindow.ORACLE_DECK = {body}\n;\n".encode("utf-8")
+
+
+def main() -> None:
+    args = parse_args()
+    deck_path = Path(args.deck)
+    root = Path(args.root) if args.root else deck_path.parent
+    out_dir = Path(args.out)
+    prepare_out_dir(out_dir, [root, deck_path])
+
+    manifest: dict[str, str] = {}
+    deck = load_deck(deck_path)
+
+    for card in deck:
+        image = normalize(card.image)
+        if not image or "://" in image:
+            continue
+        source = root / image
+        if not source.exists():
+            raise SystemExit(f"Image for {card.id} not found: {source}")
+        if image not in manifest:
+            emit(out_dir, image, source.read_bytes(), manifest)
+            # Saved readings store the image path the site used before
+            # fingerprinting, so ship the plain name too.
+            plain = out_dir / image
+            plain.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, plain)
+        card.image = f"./{manifest[image]}"
+
+    # The app falls back to the placeholder by its fixed name, so ship it
+    # under both names.
+    placeholder = root / PLACEHOLDER_IMAGE
+    if placeholder.exists():
+        emit(out_dir, PLACEHOLDER_IMAGE, placeholder.read_bytes(), manifest)
+        shutil.copyfile(placeholder, out_dir / PLACEHOLDER_IMAGE)
+
+    emit(out_dir, "deck-data.js", deck_data_js(deck_path.name, deck), manifest)
+
+    pages: dict[str, str] = {}
+    for page in sorted(root.glob("*.html")):
+        html_text = page.read_text(encoding="utf-8")
+
+        def rewrite(match: re.Match[str]) -> str:
+            reference = normalize(match.group(2))
+            if reference not in manifest:
+                source = root / reference
+                if reference.endswith(".html") or not source.is_file():
+                    return match.group(0)
+                emit(out_dir, reference, source.read_bytes(), manifest)
+            return f"{match.group(1)}{manifest[reference]}{match.group(3)}"
+
+        html_text = ASSET_REFERENCE.sub(rewrite, html_text)
+        (out_dir / page.name).write_text(html_text, encoding="utf-8")
+        pages[page.name] = content_hash(html_text.encode("utf-8"))
+
+    with (out_dir / MANIFEST_FILENAME).open("w", encoding="utf-8") as handle:
+        json.dump(dict(sorted(manifest.items())), handle, indent=2)
+        handle.write("\n")
+
+    # Workbox-style entries: hashed URLs need no revision, pages carry one.
+    precache = [{"url": url, "revision": revision} for url, revision in pages.items()]
+    if placeholder.exists():
+        precache.append({"url": PLACEHOLDER_IMAGE, "revision": content_hash(placeholder.read_bytes())})
+    precache += [{"url": hashed, "revision": None} for hashed in sorted(manifest.values())]
+    with (out_dir / PRECACHE_FILENAME).open("w", encoding="utf-8") as handle:
+        handle.write("// Auto-generated by fingerprint_assets.py\n")
+        handle.write(f"self.__PRECACHE_MANIFEST = {json.dumps(precache, indent=2)};\n")
+
+    print(f"Wrote {len(manifest)} fingerprinted asset(s) and {len(pages)} page(s) to {out_dir}.")
+
+
+if __name__ == "__main__":
+    main()
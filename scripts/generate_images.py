@@ -5,34 +5,226 @@ from __future__ import annotations
 
 import argparse
 import base64
+import hashlib
 import json
 import os
+import socket
+import statistics
+import threading
 import time
 import urllib.error
 import urllib.request
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
+from queue import Empty, SimpleQueue
 from typing import Any
 
+import work_queue
+from card_archive import CardArchive
+from deck_model import Card, load_deck, save_deck
+from generate_svg_cards import render_svg
+
 API_URL = "https://api.openai.com/v1/images/generations"
 DEFAULT_MODEL = "gpt-image-1"
 DEFAULT_SIZE = "1024x1024"
 DEFAULT_QUALITY = "auto"
 ENV_PATH = Path(".env")
 ENV_FALLBACK_PATH = Path(".env.example")
+STATE_FILENAME = ".image-state.json"
+DEFAULT_LATENCY = 20.0
+LATENCY_HISTORY = 50
+DEFAULT_REQUEST_TIMEOUT = 180.0
+WORK_KIND = "image"
+
+REASON_MISSING = "missing"
+REASON_STALE = "stale"
+REASON_FORCED = "forced"
+REASON_RANK = {REASON_MISSING: 0, REASON_STALE: 1, REASON_FORCED: 2}
 
 
-def load_deck(path: Path) -> list[dict[str, Any]]:
+def load_state(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {"cards": {}, "latencies": []}
     with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+        state = json.load(handle)
+    state.setdefault("cards", {})
+    state.setdefault("latencies", [])
+    return state
 
 
-def save_deck(path: Path, deck: list[dict[str, Any]]) -> None:
+def save_state(path: Path, state: dict[str, Any]) -> None:
+    state["latencies"] = state["latencies"][-LATENCY_HISTORY:]
     with path.open("w", encoding="utf-8") as handle:
-        json.dump(deck, handle, ensure_ascii=False, indent=2)
+        json.dump(state, handle, indent=2, sort_keys=True)
         handle.write("\n")
 
 
-def api_request(payload: dict[str, Any], api_key: str) -> bytes:
+def prompt_digest(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def build_queue(
+    deck: list[Card],
+    out_dir: Path,
+    state: dict[str, Any],
+    force: bool,
+) -> list[dict[str, Any]]:
+    """Order pending cards: missing images, then stale prompts, then forced.
+
+    Within each group, higher ``priority`` values in deck.json go first and
+    deck order breaks ties.
+    """
+    queue = []
+    for index, card in enumerate(deck):
+        if not card.prompt:
+            continue
+
+        output_path = out_dir / f"{card.id}.png"
+        recorded = state["cards"].get(card.id, {}).get("prompt_sha256")
+        if not output_path.exists():
+            reason = REASON_MISSING
+        elif recorded and recorded != prompt_digest(card.prompt):
+            reason = REASON_STALE
+        elif force:
+            reason = REASON_FORCED
+        else:
+            if not card.image:
+                card.image = f"cards/{card.id}.png"
+            continue
+
+        queue.append(
+            {
+                "index": index,
+                "card": card,
+                "reason": reason,
+                "priority": card.priority or 0.0,
+                "output_path": output_path,
+            }
+        )
+
+    queue.sort(key=lambda item: (REASON_RANK[item["reason"]], -item["priority"], item["index"]))
+    return queue
+
+
+def expected_latency(state: dict[str, Any]) -> float:
+    latencies = state["latencies"]
+    if not latencies:
+        return DEFAULT_LATENCY
+    return statistics.median(latencies)
+
+
+def budget_exhausted(
+    args: argparse.Namespace,
+    generated: int,
+    requests_made: int,
+    elapsed: float,
+    per_request: float,
+) -> str:
+    """Return a reason string if the next card would exceed a budget.
+
+    ``generated`` counts cards for ``--limit``. ``requests_made`` counts every
+    request sent, including retries and hedged duplicates, since each one is
+    billed.
+    """
+    if args.limit and generated >= args.limit:
+        return f"card limit of {args.limit} reached"
+    if args.max_requests and requests_made >= args.max_requests:
+        return f"request budget of {args.max_requests} reached"
+    if args.max_seconds and elapsed + per_request > args.max_seconds:
+        return f"time budget of {args.max_seconds:.0f}s reached"
+    if args.max_cost and (requests_made + 1) * args.cost_per_image > args.max_cost:
+        return f"cost budget of ${args.max_cost:.2f} reached"
+    return ""
+
+
+def request_usage(args: argparse.Namespace) -> dict[str, int]:
+    """Counter for requests sent, with the cap implied by the request and cost budgets."""
+    limits = []
+    if args.max_requests:
+        limits.append(args.max_requests)
+    if args.max_cost and args.cost_per_image:
+        limits.append(int(args.max_cost / args.cost_per_image + 1e-9))
+    return {"requests": 0, "limit": min(limits) if limits else 0}
+
+
+def can_send(usage: dict[str, int]) -> bool:
+    return not usage["limit"] or usage["requests"] < usage["limit"]
+
+
+class BudgetExhausted(Exception):
+    """The request or cost budget ran out before a card's retries were done."""
+
+
+def print_plan(queue: list[dict[str, Any]], args: argparse.Namespace, state: dict[str, Any]) -> None:
+    latency = expected_latency(state)
+    per_request = latency + args.sleep
+    source = f"median of {len(state['latencies'])} observed" if state["latencies"] else "default"
+    print(f"{len(queue)} card(s) pending; {latency:.1f}s per request ({source}).")
+
+    elapsed = 0.0
+    planned = 0
+    for position, item in enumerate(queue, start=1):
+        stop_reason = budget_exhausted(args, planned, planned, elapsed, per_request)
+        if stop_reason:
+            print(f"-- {stop_reason}; {len(queue) - planned} card(s) deferred --")
+            break
+        elapsed += per_request
+        planned += 1
+        print(
+            f"{position:>4}. {item['card'].id:<28} {item['reason']:<8} "
+            f"priority={item['priority']:g}  eta={elapsed:.0f}s"
+        )
+
+    print(
+        f"Projected: {planned} request(s), ~{elapsed:.0f}s, "
+        f"~${planned * args.cost_per_image:.2f} estimated cost."
+    )
+
+
+def hedge_threshold(state: dict[str, Any], percentile: float) -> float:
+    """Latency after which a duplicate request is sent, or 0 to disable."""
+    latencies = state["latencies"]
+    if not percentile or len(latencies) < 2:
+        return 0.0
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    index = min(len(cut_points) - 1, max(0, int(percentile) - 1))
+    return cut_points[index]
+
+
+def is_timeout(exc: BaseException) -> bool:
+    if isinstance(exc, (socket.timeout, TimeoutError)):
+        return True
+    if isinstance(exc, urllib.error.URLError) and not isinstance(exc, urllib.error.HTTPError):
+        return isinstance(exc.reason, (socket.timeout, TimeoutError))
+    return False
+
+
+def has_image_file(card: Card, root: Path) -> bool:
+    """True if the card's current ``image`` points at a file that exists."""
+    if not card.image or "://" in card.image:
+        return False
+    return (root / card.image).is_file()
+
+
+def write_fallback_svg(
+    card: Card,
+    out_dir: Path,
+    archive: CardArchive | None = None,
+) -> str:
+    # Same path form as generate_svg_cards.py, so the two generators agree.
+    image = f"./cards/{card.id}.svg"
+    if archive is not None:
+        svg_bytes = render_svg(card).encode("utf-8")
+        archive.add(f"cards/{card.id}.svg", svg_bytes, {"card": card.id, "image": image})
+    else:
+        svg_path = out_dir / f"{card.id}.svg"
+        svg_path.write_text(render_svg(card), encoding="utf-8")
+        card.image = image
+    return image
+
+
+def api_request(payload: dict[str, Any], api_key: str, timeout: float) -> bytes:
     data = json.dumps(payload).encode("utf-8")
     request = urllib.request.Request(
         API_URL,
@@ -43,10 +235,82 @@ def api_request(payload: dict[str, Any], api_key: str) -> bytes:
         },
         method="POST",
     )
-    with urllib.request.urlopen(request) as response:
+    with urllib.request.urlopen(request, timeout=timeout) as response:
         return response.read()
 
 
+def start_request(
+    payload: dict[str, Any],
+    api_key: str,
+    timeout: float,
+    replies: SimpleQueue,
+) -> None:
+    """Send ``api_request`` from a daemon thread and post its outcome to ``replies``.
+
+    Daemon threads are not joined at interpreter exit, so a request that is
+    abandoned after its deadline cannot keep the process alive.
+    """
+
+    def run() -> None:
+        try:
+            replies.put((api_request(payload, api_key, timeout), None))
+        except BaseException as exc:
+            replies.put((None, exc))
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def bounded_request(
+    payload: dict[str, Any],
+    api_key: str,
+    timeout: float,
+    hedge_after: float,
+    usage: dict[str, int],
+) -> bytes:
+    """Run ``api_request`` with a hard total deadline, optionally hedged.
+
+    The socket timeout only limits each blocking read, so the wait here is
+    what bounds the request as a whole. If ``hedge_after`` is set and the
+    first request is still running by then, one duplicate is sent and
+    whichever copy finishes first wins. Every request sent is counted in
+    ``usage["requests"]``. Raises ``TimeoutError`` if nothing succeeds
+    before ``timeout``.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    replies: SimpleQueue = SimpleQueue()
+    start_request(payload, api_key, timeout, replies)
+    usage["requests"] += 1
+    in_flight = 1
+    hedge_at = started + hedge_after if 0 < hedge_after < timeout else 0.0
+
+    error: BaseException | None = None
+    while in_flight:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        wake_at = min(deadline, hedge_at) if hedge_at else deadline
+        try:
+            data, exc = replies.get(timeout=max(0.0, wake_at - now))
+        except Empty:
+            if hedge_at and time.monotonic() >= hedge_at:
+                if can_send(usage):
+                    print(f"Hedging request after {hedge_after:.1f}s...")
+                    start_request(payload, api_key, max(0.1, deadline - time.monotonic()), replies)
+                    usage["requests"] += 1
+                    in_flight += 1
+                hedge_at = 0.0
+            continue
+        in_flight -= 1
+        if exc is None:
+            return data
+        error = exc
+
+    if error is not None and not in_flight:
+        raise error
+    raise TimeoutError(f"request exceeded {timeout:.1f}s deadline")
+
+
 def generate_image(
     prompt: str,
     model: str,
@@ -54,6 +318,9 @@ def generate_image(
     quality: str,
     output_format: str,
     api_key: str,
+    timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    hedge_after: float = 0.0,
+    usage: dict[str, int] | None = None,
 ) -> bytes:
     payload = {
         "model": model,
@@ -63,7 +330,9 @@ def generate_image(
     }
     if output_format:
         payload["output_format"] = output_format
-    raw = api_request(payload, api_key)
+    if usage is None:
+        usage = {"requests": 0, "limit": 0}
+    raw = bounded_request(payload, api_key, timeout, hedge_after, usage)
     data = json.loads(raw.decode("utf-8"))
     image_b64 = data["data"][0]["b64_json"]
     return base64.b64decode(image_b64)
@@ -78,12 +347,256 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--quality", default=DEFAULT_QUALITY, help="Image quality")
     parser.add_argument("--output-format", default="", help="png, jpeg, or webp")
     parser.add_argument("--limit", type=int, default=0, help="Max number of cards to generate")
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=0,
+        help="Max number of API requests, counting retries and hedged duplicates",
+    )
+    parser.add_argument("--max-seconds", type=float, default=0, help="Wall-clock budget for the run")
+    parser.add_argument("--max-cost", type=float, default=0, help="Estimated cost budget in USD")
+    parser.add_argument(
+        "--cost-per-image", type=float, default=0.04, help="Estimated USD cost per request"
+    )
+    parser.add_argument("--plan", action="store_true", help="Print the queue and projection, then exit")
     parser.add_argument("--force", action="store_true", help="Overwrite existing images")
     parser.add_argument("--sleep", type=float, default=0.8, help="Seconds to wait between requests")
     parser.add_argument("--max-retries", type=int, default=3, help="Retry attempts per card")
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=DEFAULT_REQUEST_TIMEOUT,
+        help="Seconds before a single request is abandoned",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=0,
+        help="Seconds for the whole run; cards not generated in time fall back to SVG",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=0,
+        help="Send a duplicate request once a call exceeds this latency percentile, e.g. 90",
+    )
+    parser.add_argument(
+        "--no-fallback",
+        dest="fallback",
+        action="store_false",
+        help="Do not render SVG art for cards whose request missed its deadline",
+    )
+    parser.add_argument("--queue", default="", help="Shared SQLite work queue for multi-worker runs")
+    parser.add_argument("--worker-id", default="", help="Worker name in the queue (default: host-pid)")
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=work_queue.DEFAULT_LEASE_SECONDS,
+        help="Lease length before an unresponsive worker's card is reclaimed",
+    )
+    parser.add_argument(
+        "--archive",
+        default="",
+        help="Write generated images into one .zip/.tar/.tar.gz archive instead of --out",
+    )
+    parser.add_argument("--compress", action="store_true", help="Compress archive entries")
     return parser.parse_args()
 
 
+def fetch_card_image(
+    card: Card,
+    args: argparse.Namespace,
+    api_key: str,
+    state: dict[str, Any],
+    run_deadline: float,
+    usage: dict[str, int],
+) -> tuple[bytes, float] | None:
+    """Request one card's art with retries.
+
+    Returns the image bytes and request latency, or None if the card missed
+    the run deadline or timed out on its last attempt. Callers decide whether
+    a missed card gets SVG art.
+    """
+    card_id = card.id
+    attempt = 0
+    while True:
+        attempt += 1
+        timeout = args.request_timeout
+        if run_deadline:
+            timeout = min(timeout, max(0.1, run_deadline - time.monotonic()))
+        request_started = time.monotonic()
+        try:
+            image_bytes = generate_image(
+                card.prompt,
+                args.model,
+                args.size,
+                args.quality,
+                args.output_format,
+                api_key,
+                timeout,
+                hedge_threshold(state, args.hedge_percentile),
+                usage,
+            )
+            return image_bytes, round(time.monotonic() - request_started, 3)
+        except urllib.error.HTTPError as exc:
+            if attempt < args.max_retries and not can_send(usage):
+                raise BudgetExhausted(f"request budget used up retrying {card_id} after HTTP {exc.code}") from exc
+            if attempt >= args.max_retries:
+                error_body = ""
+                try:
+                    error_body = exc.read().decode("utf-8", errors="replace")
+                except Exception:
+                    error_body = "<unable to read error body>"
+                raise SystemExit(
+                    f"OpenAI API error {exc.code} for {card_id}: {error_body}"
+                ) from exc
+            wait_for = args.sleep * attempt
+            print(f"Retrying {card_id} after HTTP {exc.code} ({attempt}/{args.max_retries})...")
+            time.sleep(wait_for)
+        except (urllib.error.URLError, TimeoutError, socket.timeout) as exc:
+            out_of_time = run_deadline and time.monotonic() >= run_deadline
+            last_try = attempt >= args.max_retries
+            if out_of_time or (is_timeout(exc) and last_try):
+                print(f"{card_id} missed its deadline.")
+                return None
+            if last_try:
+                raise
+            if not can_send(usage):
+                raise BudgetExhausted(f"request budget used up retrying {card_id} after a network error") from exc
+            wait_for = args.sleep * attempt
+            print(f"Retrying {card_id} after network error ({attempt}/{args.max_retries})...")
+            time.sleep(wait_for)
+
+
+def run_worker(
+    args: argparse.Namespace,
+    deck_path: Path,
+    out_dir: Path,
+    api_key: str,
+) -> None:
+    """Generate cards leased from a shared work queue, then merge all results."""
+    queue_path = Path(args.queue)
+    deck_key = str(deck_path.resolve())
+    worker = args.worker_id or work_queue.default_worker_id()
+    conn = work_queue.connect(queue_path)
+
+    deck = load_deck(deck_path)
+    state = load_state(out_dir / STATE_FILENAME)
+    cards = {card.id: card for card in deck if card.prompt}
+    pending = build_queue(deck, out_dir, state, args.force)
+    work_queue.enqueue(conn, deck_key, WORK_KIND, [item["card"].id for item in pending])
+
+    started = time.monotonic()
+    run_deadline = started + args.deadline if args.deadline else 0.0
+    usage = request_usage(args)
+    generated = 0
+    observed: list[float] = []
+    deadline_hit = False
+
+    try:
+        while True:
+            stop_reason = budget_exhausted(
+                args,
+                generated,
+                usage["requests"],
+                time.monotonic() - started,
+                expected_latency(state) + args.sleep,
+            )
+            if run_deadline and time.monotonic() >= run_deadline:
+                stop_reason = f"run deadline of {args.deadline:.0f}s reached"
+                deadline_hit = True
+            if stop_reason:
+                print(f"{worker} stopping: {stop_reason}.")
+                break
+
+            card_id = work_queue.lease(conn, deck_key, WORK_KIND, worker, args.lease_seconds)
+            if card_id is None:
+                if work_queue.wait_for_work(conn, deck_key, WORK_KIND):
+                    continue
+                break
+            card = cards.get(card_id)
+            if card is None:
+                work_queue.complete(conn, deck_key, WORK_KIND, card_id, worker, {})
+                continue
+
+            output_path = out_dir / f"{card_id}.png"
+            try:
+                with work_queue.Heartbeat(
+                    queue_path, deck_key, WORK_KIND, card_id, worker, args.lease_seconds
+                ):
+                    fetched = fetch_card_image(card, args, api_key, state, run_deadline, usage)
+            except BudgetExhausted as exc:
+                work_queue.release(conn, deck_key, WORK_KIND, card_id, worker)
+                print(f"{worker} stopping: {exc}.")
+                break
+            except BaseException:
+                work_queue.release(conn, deck_key, WORK_KIND, card_id, worker)
+                raise
+
+            if fetched is None and run_deadline and time.monotonic() >= run_deadline:
+                # Leave it queued; the merge below decides on a stand-in.
+                work_queue.release(conn, deck_key, WORK_KIND, card_id, worker)
+                continue
+            if fetched is None:
+                if not args.fallback or has_image_file(card, deck_path.parent):
+                    result: dict[str, Any] = {}
+                    write = None
+                else:
+                    result = {"image": f"./cards/{card_id}.svg"}
+                    write = partial(write_fallback_svg, card, out_dir)
+            else:
+                image_bytes, latency = fetched
+                state["latencies"].append(latency)
+                observed.append(latency)
+                result = {
+                    "image": f"cards/{card_id}.png",
+                    "prompt_sha256": prompt_digest(card.prompt),
+                }
+                write = partial(output_path.write_bytes, image_bytes)
+
+            if not work_queue.complete(conn, deck_key, WORK_KIND, card_id, worker, result, write):
+                print(f"Lease on {card_id} was reclaimed; discarding result.")
+            elif fetched is not None:
+                generated += 1
+            time.sleep(args.sleep)
+    finally:
+        # Every worker merges on exit, including after an error; merging is
+        # idempotent, so whichever worker finishes last leaves deck.json and the
+        # state file complete.
+        # The deck is reloaded here, so the image paths build_queue filled in for
+        # existing PNGs are applied again.
+        with work_queue.locked(conn):
+            deck = load_deck(deck_path)
+            state = load_state(out_dir / STATE_FILENAME)
+            finished = work_queue.results(conn, deck_key, WORK_KIND)
+            for card in deck:
+                result = finished.get(card.id)
+                if result:
+                    card.image = result["image"]
+                    if "prompt_sha256" in result:
+                        state["cards"][card.id] = {"prompt_sha256": result["prompt_sha256"]}
+                elif card.prompt and not card.image and (out_dir / f"{card.id}.png").exists():
+                    card.image = f"cards/{card.id}.png"
+
+            if deadline_hit and args.fallback:
+                # Cards the deadline left in the queue count as missed. They stay
+                # queued, so a later run that generates them replaces the stand-in.
+                by_id = {card.id: card for card in deck}
+                for card_id in work_queue.unfinished(conn, deck_key, WORK_KIND):
+                    card = by_id.get(card_id)
+                    if card is None or has_image_file(card, deck_path.parent):
+                        continue
+                    print(f"Fell back to {write_fallback_svg(card, out_dir)}.")
+
+            state["latencies"].extend(observed)
+            save_deck(deck_path, deck)
+            save_state(out_dir / STATE_FILENAME, state)
+
+    left = work_queue.remaining(conn, deck_key, WORK_KIND)
+    conn.close()
+    print(f"{worker} generated {generated} image(s); {left} card(s) left in queue.")
+
+
 def load_env_file(path: Path) -> None:
     if not path.exists():
         return
@@ -101,74 +614,119 @@ def main() -> None:
     load_env_file(ENV_PATH)
     load_env_file(ENV_FALLBACK_PATH)
     args = parse_args()
+    deck_path = Path(args.deck)
+    out_dir = Path(args.out)
+    state_path = out_dir / STATE_FILENAME
+
+    deck = load_deck(deck_path)
+    state = load_state(state_path)
+    queue = build_queue(deck, out_dir, state, args.force)
+
+    if args.plan:
+        print_plan(queue, args, state)
+        return
+
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         raise SystemExit("OPENAI_API_KEY is not set in the environment.")
 
-    deck_path = Path(args.deck)
-    out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
+    if args.queue:
+        if args.archive:
+            raise SystemExit("--archive cannot be combined with --queue.")
+        run_worker(args, deck_path, out_dir, api_key)
+        return
 
-    deck = load_deck(deck_path)
+    archive = CardArchive(Path(args.archive), args.compress) if args.archive else None
+
+    started = time.monotonic()
+    run_deadline = started + args.deadline if args.deadline else 0.0
+    usage = request_usage(args)
     generated = 0
+    fallbacks: list[dict[str, Any]] = []
 
-    for card in deck:
-        if args.limit and generated >= args.limit:
-            break
+    # Save even if a card fails, so images already written (and paid for)
+    # stay recorded in deck.json and the state file.
+    try:
+        with archive if archive is not None else nullcontext():
+            for position, item in enumerate(queue):
+                if run_deadline and time.monotonic() >= run_deadline:
+                    # Cards the deadline cut off count as missed, like a timed-out request.
+                    fallbacks.extend(queue[position:])
+                    print(f"Stopping: run deadline of {args.deadline:.0f}s reached.")
+                    break
+                stop_reason = budget_exhausted(
+                    args,
+                    generated,
+                    usage["requests"],
+                    time.monotonic() - started,
+                    expected_latency(state) + args.sleep,
+                )
+                if stop_reason:
+                    print(f"Stopping: {stop_reason}; {len(queue) - position} card(s) deferred.")
+                    break
 
-        card_id = card.get("id")
-        prompt = card.get("prompt")
-        if not card_id or not prompt:
-            continue
+                card = item["card"]
+                card_id = card.id
+                output_path = item["output_path"]
+                card_image_path = f"cards/{card_id}.png"
 
-        output_path = out_dir / f"{card_id}.png"
-        card_image_path = f"cards/{card_id}.png"
+                try:
+                    fetched = fetch_card_image(card, args, api_key, state, run_deadline, usage)
+                except BudgetExhausted as exc:
+                    print(f"Stopping: {exc}; {len(queue) - position} card(s) deferred.")
+                    break
+                if fetched is None:
+                    fallbacks.append(item)
+                else:
+                    image_bytes, latency = fetched
+                    state["latencies"].append(latency)
+                    digest = prompt_digest(card.prompt)
+                    if archive is not None:
+                        # deck.json and the state file describe files on disk;
+                        # the archive index carries what to apply on extraction.
+                        archive.add(
+                            card_image_path,
+                            image_bytes,
+                            {"card": card_id, "image": card_image_path, "prompt_sha256": digest},
+                        )
+                    else:
+                        output_path.write_bytes(image_bytes)
+                        card.image = card_image_path
+                        state["cards"][card_id] = {"prompt_sha256": digest}
+                    generated += 1
 
-        if output_path.exists() and not args.force:
-            if not card.get("image"):
-                card["image"] = card_image_path
-            continue
+                time.sleep(args.sleep)
 
-        attempt = 0
-        while True:
-            attempt += 1
-            try:
-                image_bytes = generate_image(
-                    prompt,
-                    args.model,
-                    args.size,
-                    args.quality,
-                    args.output_format,
-                    api_key,
-                )
-                output_path.write_bytes(image_bytes)
-                card["image"] = card_image_path
-                generated += 1
-                break
-            except urllib.error.HTTPError as exc:
-                if attempt >= args.max_retries:
-                    error_body = ""
-                    try:
-                        error_body = exc.read().decode("utf-8", errors="replace")
-                    except Exception:
-                        error_body = "<unable to read error body>"
-                    raise SystemExit(
-                        f"OpenAI API error {exc.code} for {card_id}: {error_body}"
-                    ) from exc
-                wait_for = args.sleep * attempt
-                print(f"Retrying {card_id} after HTTP {exc.code} ({attempt}/{args.max_retries})...")
-                time.sleep(wait_for)
-            except urllib.error.URLError:
-                if attempt >= args.max_retries:
-                    raise
-                wait_for = args.sleep * attempt
-                print(f"Retrying {card_id} after network error ({attempt}/{args.max_retries})...")
-                time.sleep(wait_for)
-
-        time.sleep(args.sleep)
-
-    save_deck(deck_path, deck)
-    print(f"Generated {generated} image(s).")
+            if args.fallback:
+                # Only cards that missed a deadline and have no usable art at all get
+                # a stand-in; an existing image of any kind is left alone.
+                for item in fallbacks:
+                    if has_image_file(item["card"], deck_path.parent):
+                        continue
+                    image_path = write_fallback_svg(item["card"], out_dir, archive)
+                    print(f"Fell back to {image_path}.")
+
+            if archive is not None:
+                # Cards this run did not write keep their files on disk; copy them in
+                # so the archive holds every card's art.
+                written = {entry.get("card") for entry in archive.entries}
+                for card in deck:
+                    name = Path(card.image).as_posix() if card.image else ""
+                    if card.id in written or name.startswith(("/", "..")):
+                        continue
+                    if not has_image_file(card, deck_path.parent):
+                        continue
+                    archive.add(
+                        name, (deck_path.parent / name).read_bytes(), {"card": card.id, "image": card.image}
+                    )
+    finally:
+        save_deck(deck_path, deck)
+        save_state(state_path, state)
+
+    if archive is not None:
+        print(f"Wrote {len(archive.entries)} file(s) to {archive.path}.")
+    print(f"Generated {generated} image(s) with {usage['requests']} request(s).")
 
 
 if __name__ == "__main__":
@@ -12,9 +12,12 @@ from __future__ import annotations
 import argparse
 import hashlib
 import html
-import json
+from functools import partial
 from pathlib import Path
-from typing import Any
+
+import work_queue
+from card_archive import CardArchive
+from deck_model import Card, load_deck, save_deck
 
 
 PALETTES: list[dict[str, str]] = [
@@ -157,24 +160,24 @@ ICON_BY_ID = {
 }
 
 
+WORK_KIND = "svg"
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate SVG art for oracle cards.")
     parser.add_argument("--deck", default="deck.json", help="Path to deck data JSON")
     parser.add_argument("--cards-dir", default="cards", help="Output directory for SVG files")
+    parser.add_argument("--queue", default="", help="Shared SQLite work queue for multi-worker runs")
+    parser.add_argument("--worker-id", default="", help="Worker name in the queue (default: host-pid)")
+    parser.add_argument(
+        "--archive",
+        default="",
+        help="Write all SVGs into one .zip/.tar/.tar.gz archive instead of --cards-dir",
+    )
+    parser.add_argument("--compress", action="store_true", help="Compress archive entries")
     return parser.parse_args()
 
 
-def load_deck(deck_path: Path) -> list[dict[str, Any]]:
-    with deck_path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
-def save_deck(deck_path: Path, deck: list[dict[str, Any]]) -> None:
-    with deck_path.open("w", encoding="utf-8") as handle:
-        json.dump(deck, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
-
-
 def seed_for(value: str) -> int:
     digest = hashlib.sha256(value.encode("utf-8")).hexdigest()
     return int(digest[:16], 16)
@@ -566,9 +569,9 @@ def pig_markup(seed: int, palette: dict[str, str]) -> str:
     )
 
 
-def render_svg(card: dict[str, Any]) -> str:
-    card_id = str(card.get("id", "card")).strip()
-    title = str(card.get("title", card_id)).strip()
+def render_svg(card: Card) -> str:
+    card_id = card.id
+    title = card.title
     seed = seed_for(card_id)
     palette = pick_palette(seed)
     icon = ICON_BY_ID.get(card_id, "spark")
@@ -604,21 +607,88 @@ def render_svg(card: dict[str, Any]) -> str:
     )
 
 
+def write_svg(card: Card, svg_path: Path) -> None:
+    svg_path.write_text(render_svg(card), encoding="utf-8")
+
+
+def write_archive(deck_path: Path, archive_path: Path, compress: bool) -> None:
+    deck = load_deck(deck_path)
+
+    # deck.json keeps pointing at files on disk; the index records the path
+    # each card gets once the archive is extracted.
+    with CardArchive(archive_path, compress) as archive:
+        for card in deck:
+            archive.add(
+                f"cards/{card.id}.svg",
+                render_svg(card).encode("utf-8"),
+                {"card": card.id, "image": f"./cards/{card.id}.svg"},
+            )
+
+    print(f"Generated {len(archive.entries)} SVG files in {archive_path}.")
+
+
+def run_worker(args: argparse.Namespace, deck_path: Path, cards_dir: Path) -> None:
+    """Render cards leased from a shared work queue, then merge all results."""
+    queue_path = Path(args.queue)
+    deck_key = str(deck_path.resolve())
+    worker = args.worker_id or work_queue.default_worker_id()
+    conn = work_queue.connect(queue_path)
+
+    deck = load_deck(deck_path)
+    cards = {card.id: card for card in deck}
+    work_queue.enqueue(conn, deck_key, WORK_KIND, list(cards))
+
+    rendered = 0
+    while True:
+        card_id = work_queue.lease(conn, deck_key, WORK_KIND, worker)
+        if card_id is None:
+            if work_queue.wait_for_work(conn, deck_key, WORK_KIND):
+                continue
+            break
+        card = cards.get(card_id)
+        if card is None:
+            work_queue.complete(conn, deck_key, WORK_KIND, card_id, worker, {})
+            continue
+        result = {"image": f"./cards/{card_id}.svg"}
+        write = partial(write_svg, card, cards_dir / f"{card_id}.svg")
+        if work_queue.complete(conn, deck_key, WORK_KIND, card_id, worker, result, write):
+            rendered += 1
+
+    with work_queue.locked(conn):
+        deck = load_deck(deck_path)
+        results = work_queue.results(conn, deck_key, WORK_KIND)
+        for card in deck:
+            result = results.get(card.id)
+            if result:
+                card.image = result["image"]
+        save_deck(deck_path, deck)
+
+    left = work_queue.remaining(conn, deck_key, WORK_KIND)
+    conn.close()
+    print(f"{worker} rendered {rendered} SVG file(s); {left} card(s) left in queue.")
+
+
 def main() -> None:
     args = parse_args()
     deck_path = Path(args.deck)
     cards_dir = Path(args.cards_dir)
+
+    if args.archive:
+        if args.queue:
+            raise SystemExit("--archive cannot be combined with --queue.")
+        write_archive(deck_path, Path(args.archive), args.compress)
+        return
+
     cards_dir.mkdir(parents=True, exist_ok=True)
+    if args.queue:
+        run_worker(args, deck_path, cards_dir)
+        return
 
     deck = load_deck(deck_path)
 
     for card in deck:
-        card_id = str(card.get("id", "")).strip()
-        if not card_id:
-            continue
-        svg_path = cards_dir / f"{card_id}.svg"
-        svg_path.write_text(render_svg(card), encoding="utf-8")
-        card["image"] = f"./cards/{card_id}.svg"
+        write_svg(card, cards_dir / f"{card.id}.svg")
+        card.image = f"./cards/{card.id}.svg"
 
     save_deck(deck_path, deck)
     print(f"Generated {len(deck)} SVG files in {cards_dir}.")
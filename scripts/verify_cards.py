@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Verify that the files in cards/ match deck.json.
+
+This script:
+1) hashes and structurally validates every card asset in parallel
+2) cross-checks each card's image path against the files on disk
+3) compares hashes against a stored manifest and the current generators
+4) reports missing, orphaned, corrupt and stale files
+
+Missing, corrupt or stale files make the script exit with status 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree
+
+from deck_model import Card, load_deck
+from generate_svg_cards import render_svg
+
+MANIFEST_FILENAME = ".manifest.json"
+IMAGE_STATE_FILENAME = ".image-state.json"
+ASSET_SUFFIXES = {".png", ".svg", ".jpg", ".jpeg", ".webp"}
+ALWAYS_KEEP = {"placeholder.svg"}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+SVG_NAMESPACE = "{http://www.w3.org/2000/svg}svg"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Verify card assets against deck data.")
+    parser.add_argument("--deck", default="deck.json", help="Path to deck data JSON")
+    parser.add_argument("--cards-dir", default="cards", help="Directory containing card assets")
+    parser.add_argument(
+        "--root", default="", help="Site root for image paths (default: the deck's directory)"
+    )
+    parser.add_argument("--manifest", default="", help="Manifest path (default: <cards-dir>/.manifest.json)")
+    parser.add_argument("--write-manifest", action="store_true", help="Record current hashes as the manifest")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    return parser.parse_args()
+
+
+def load_json(path: Path, default: dict[str, Any]) -> dict[str, Any]:
+    if not path.exists():
+        return default
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def check_png(data: mmap.mmap | bytes) -> str:
+    if data[:8] != PNG_SIGNATURE:
+        return "bad PNG signature"
+    offset = 8
+    first = True
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset : offset + 8])
+        end = offset + 12 + length
+        if end > len(data):
+            return f"truncated {chunk_type.decode('latin-1')} chunk"
+        if first and chunk_type != b"IHDR":
+            return "first chunk is not IHDR"
+        (crc,) = struct.unpack(">I", data[end - 4 : end])
+        if zlib.crc32(data[offset + 4 : end - 4]) != crc:
+            return f"CRC mismatch in {chunk_type.decode('latin-1')} chunk"
+        if chunk_type == b"IEND":
+            return "" if end == len(data) else "trailing data after IEND"
+        first = False
+        offset = end
+    return "missing IEND chunk"
+
+
+def check_svg(data: mmap.mmap | bytes) -> str:
+    try:
+        root = ElementTree.fromstring(bytes(data))
+    except ElementTree.ParseError as exc:
+        return f"malformed SVG ({exc})"
+    if root.tag not in (SVG_NAMESPACE, "svg"):
+        return f"root element is {root.tag}, not svg"
+    return ""
+
+
+def check_jpeg(data: mmap.mmap | bytes) -> str:
+    if data[:2] != b"\xff\xd8":
+        return "bad JPEG signature"
+    if data[-2:] != b"\xff\xd9":
+        return "missing JPEG end marker"
+    return ""
+
+
+def check_webp(data: mmap.mmap | bytes) -> str:
+    if data[:4] != b"RIFF" or data[8:12] != b"WEBP":
+        return "bad WebP signature"
+    (size,) = struct.unpack("<I", data[4:8])
+    if size + 8 != len(data):
+        return "WebP size does not match file length"
+    return ""
+
+
+CHECKS = {
+    ".png": check_png,
+    ".svg": check_svg,
+    ".jpg": check_jpeg,
+    ".jpeg": check_jpeg,
+    ".webp": check_webp,
+}
+
+
+def inspect_asset(path_str: str) -> dict[str, Any]:
+    """Hash and validate one file. Runs in a worker process."""
+    path = Path(path_str)
+    size = path.stat().st_size
+    if size == 0:
+        return {"name": path.name, "size": 0, "sha256": "", "error": "empty file"}
+
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        digest = hashlib.sha256(data).hexdigest()
+        error = CHECKS[path.suffix.lower()](data)
+    return {"name": path.name, "size": size, "sha256": digest, "error": error}
+
+
+def local_image(card: Card, root: Path) -> Path | None:
+    """Resolve a card's image against the site root, or None for remote images."""
+    image = card.image
+    if not image or "://" in image or image.startswith("data:"):
+        return None
+    return (root / image).resolve()
+
+
+def main() -> None:
+    args = parse_args()
+    deck_path = Path(args.deck)
+    cards_dir = Path(args.cards_dir)
+    root = Path(args.root) if args.root else deck_path.parent
+    cards_dir_resolved = cards_dir.resolve()
+    manifest_path = Path(args.manifest) if args.manifest else cards_dir / MANIFEST_FILENAME
+
+    deck = load_deck(deck_path)
+    manifest = load_json(manifest_path, {"files": {}})["files"]
+    image_state = load_json(cards_dir / IMAGE_STATE_FILENAME, {"cards": {}})["cards"]
+
+    assets = sorted(
+        path
+        for path in cards_dir.iterdir()
+        if path.is_file() and not path.name.startswith(".") and path.suffix.lower() in ASSET_SUFFIXES
+    )
+    with ProcessPoolExecutor(max_workers=args.workers or None) as pool:
+        chunksize = max(1, len(assets) // ((args.workers or 8) * 4))
+        results = {
+            result["name"]: result
+            for result in pool.map(inspect_asset, [str(path) for path in assets], chunksize=chunksize)
+        }
+
+    missing: list[str] = []
+    corrupt: list[str] = []
+    stale: list[str] = []
+    referenced: set[str] = set()
+
+    for card in deck:
+        card_id = card.id
+        image_path = local_image(card, root)
+        if image_path is None:
+            continue
+        if image_path.parent != cards_dir_resolved:
+            missing.append(f"{card.image} (card {card_id}): not in {cards_dir}")
+            continue
+        name = image_path.name
+        referenced.add(name)
+        result = results.get(name)
+        if result is None:
+            missing.append(f"{name} (card {card_id})")
+            continue
+        if result["error"]:
+            continue
+        if name.endswith(".svg"):
+            expected = hashlib.sha256(render_svg(card).encode("utf-8")).hexdigest()
+            if result["sha256"] != expected:
+                stale.append(f"{name}: differs from generate_svg_cards output")
+        recorded = image_state.get(card_id, {}).get("prompt_sha256")
+        if not name.endswith(".svg") and recorded:
+            if recorded != hashlib.sha256(card.prompt.encode("utf-8")).hexdigest():
+                stale.append(f"{name}: prompt changed since generation")
+
+    for name, result in results.items():
+        if result["error"]:
+            corrupt.append(f"{name}: {result['error']}")
+        elif name in manifest and manifest[name]["sha256"] != result["sha256"]:
+            stale.append(f"{name}: hash differs from manifest")
+
+    # Reported by the card loop above if a card still references them.
+    for name in sorted(set(manifest) - set(results) - referenced):
+        missing.append(f"{name}: listed in manifest")
+
+    orphaned = sorted(name for name in results if name not in referenced and name not in ALWAYS_KEEP)
+
+    print(f"Checked {len(results)} file(s) for {len(deck)} card(s) in {cards_dir}.")
+    for label, entries in (
+        ("Missing", missing),
+        ("Orphaned", orphaned),
+        ("Corrupt", corrupt),
+        ("Stale", sorted(stale)),
+    ):
+        print(f"{label}: {len(entries)}")
+        for entry in entries:
+            print(f"  {entry}")
+
+    if args.write_manifest:
+        files = {
+            name: {"sha256": result["sha256"], "size": result["size"]}
+            for name, result in sorted(results.items())
+            if not result["error"]
+        }
+        with manifest_path.open("w", encoding="utf-8") as handle:
+            json.dump({"files": files}, handle, indent=2)
+            handle.write("\n")
+        print(f"Wrote {manifest_path}.")
+
+    if missing or corrupt or stale:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
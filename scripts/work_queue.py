@@ -0,0 +1,242 @@
+"""SQLite-backed work queue shared by the card generators.
+
+Several processes can split one or more decks through a single queue file:
+each worker leases a card, renews the lease with heartbeats while it works,
+and commits the result. Leases that stop being renewed expire and go back to
+the queue, so a crashed worker never strands a card, and a card that has been
+committed is never handed out again.
+
+The queue file uses SQLite's write-ahead log, which relies on shared memory
+between the processes, so every worker must run on the same host with the
+queue on a local filesystem. Network filesystems such as NFS or SMB are not
+supported.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+DEFAULT_LEASE_SECONDS = 120.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    deck TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    PRIMARY KEY (deck, kind, card_id)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (deck, kind, status, priority);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextmanager
+def locked(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Hold the queue's write lock, e.g. while merging results into a deck."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def enqueue(conn: sqlite3.Connection, deck: str, kind: str, card_ids: list[str]) -> None:
+    """Add cards in priority order. Cards already queued keep their state."""
+    with locked(conn):
+        conn.executemany(
+            "INSERT OR IGNORE INTO tasks (deck, kind, card_id, priority) VALUES (?, ?, ?, ?)",
+            [(deck, kind, card_id, position) for position, card_id in enumerate(card_ids)],
+        )
+
+
+def lease(
+    conn: sqlite3.Connection,
+    deck: str,
+    kind: str,
+    worker: str,
+    ttl: float = DEFAULT_LEASE_SECONDS,
+) -> str | None:
+    """Claim the highest-priority pending or expired card, or None if none are left."""
+    with locked(conn):
+        now = time.time()
+        row = conn.execute(
+            "SELECT card_id FROM tasks WHERE deck = ? AND kind = ? "
+            "AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+            "ORDER BY priority LIMIT 1",
+            (deck, kind, now),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, "
+            "attempts = attempts + 1 WHERE deck = ? AND kind = ? AND card_id = ?",
+            (worker, now + ttl, deck, kind, row[0]),
+        )
+    return row[0]
+
+
+def heartbeat(
+    conn: sqlite3.Connection,
+    deck: str,
+    kind: str,
+    card_id: str,
+    worker: str,
+    ttl: float = DEFAULT_LEASE_SECONDS,
+) -> bool:
+    """Extend a lease. Returns False if the worker no longer holds it."""
+    cursor = conn.execute(
+        "UPDATE tasks SET lease_expires = ? WHERE deck = ? AND kind = ? AND card_id = ? "
+        "AND status = 'leased' AND worker = ?",
+        (time.time() + ttl, deck, kind, card_id, worker),
+    )
+    return cursor.rowcount == 1
+
+
+def complete(
+    conn: sqlite3.Connection,
+    deck: str,
+    kind: str,
+    card_id: str,
+    worker: str,
+    result: dict[str, Any],
+    write: Callable[[], None] | None = None,
+) -> bool:
+    """Commit a leased card's result.
+
+    ``write`` runs while the queue is locked and only if the worker still
+    holds the lease, so a worker whose lease was reclaimed cannot overwrite
+    the output of the worker that took over. Returns False in that case.
+    """
+    with locked(conn):
+        row = conn.execute(
+            "SELECT status, worker FROM tasks WHERE deck = ? AND kind = ? AND card_id = ?",
+            (deck, kind, card_id),
+        ).fetchone()
+        if row != ("leased", worker):
+            return False
+        if write is not None:
+            write()
+        conn.execute(
+            "UPDATE tasks SET status = 'done', lease_expires = NULL, result = ? "
+            "WHERE deck = ? AND kind = ? AND card_id = ?",
+            (json.dumps(result), deck, kind, card_id),
+        )
+    return True
+
+
+def release(conn: sqlite3.Connection, deck: str, kind: str, card_id: str, worker: str) -> None:
+    """Return a leased card to the queue so another worker can retry it."""
+    conn.execute(
+        "UPDATE tasks SET status = 'pending', worker = NULL, lease_expires = NULL "
+        "WHERE deck = ? AND kind = ? AND card_id = ? AND status = 'leased' AND worker = ?",
+        (deck, kind, card_id, worker),
+    )
+
+
+def wait_for_work(conn: sqlite3.Connection, deck: str, kind: str, poll: float = 1.0) -> bool:
+    """Wait while other workers hold the remaining leases.
+
+    Returns False once every card is done. Otherwise sleeps until a lease
+    could have expired (at most ``poll`` seconds) and returns True so the
+    caller can try to lease again.
+    """
+    row = conn.execute(
+        "SELECT COUNT(*), MIN(lease_expires) FROM tasks "
+        "WHERE deck = ? AND kind = ? AND status != 'done'",
+        (deck, kind),
+    ).fetchone()
+    count, next_expiry = row
+    if not count:
+        return False
+    delay = poll if next_expiry is None else next_expiry - time.time()
+    time.sleep(min(poll, max(0.05, delay)))
+    return True
+
+
+def results(conn: sqlite3.Connection, deck: str, kind: str) -> dict[str, dict[str, Any]]:
+    rows = conn.execute(
+        "SELECT card_id, result FROM tasks WHERE deck = ? AND kind = ? AND status = 'done'",
+        (deck, kind),
+    )
+    return {card_id: json.loads(result) for card_id, result in rows}
+
+
+def unfinished(conn: sqlite3.Connection, deck: str, kind: str) -> list[str]:
+    """Card ids that are still pending or leased, in priority order."""
+    rows = conn.execute(
+        "SELECT card_id FROM tasks WHERE deck = ? AND kind = ? AND status != 'done' "
+        "ORDER BY priority",
+        (deck, kind),
+    )
+    return [card_id for (card_id,) in rows]
+
+
+def remaining(conn: sqlite3.Connection, deck: str, kind: str) -> int:
+    (count,) = conn.execute(
+        "SELECT COUNT(*) FROM tasks WHERE deck = ? AND kind = ? AND status != 'done'",
+        (deck, kind),
+    ).fetchone()
+    return count
+
+
+class Heartbeat:
+    """Renew a lease from a background thread while the card is being worked on."""
+
+    def __init__(
+        self,
+        path: Path,
+        deck: str,
+        kind: str,
+        card_id: str,
+        worker: str,
+        ttl: float = DEFAULT_LEASE_SECONDS,
+    ) -> None:
+        self.path = path
+        self.args = (deck, kind, card_id, worker, ttl)
+        self.interval = ttl / 3
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self) -> None:
+        conn = connect(self.path)
+        try:
+            while not self.stopped.wait(self.interval):
+                if not heartbeat(conn, *self.args):
+                    print(f"Lost lease on {self.args[2]}.")
+                    return
+        finally:
+            conn.close()
+
+    def __enter__(self) -> Heartbeat:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stopped.set()
+        self.thread.join()